@@ -1,16 +1,28 @@
+import re
 from datetime import date, datetime, timedelta
 from typing import Optional
 
 import numpy as np
+import orjson
 import pandas as pd
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from src.pjm_like_day import configs
 from src.pjm_like_day.pipeline import run
 
 import logging
-logging.basicConfig(level=logging.INFO)
+
+logger = logging.getLogger(__name__)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson (native date, datetime and numpy support; NaN → null)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
 
 app = FastAPI(
     title="Helios CTA - PJM Like Day API",
@@ -24,8 +36,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-VALID_MARKETS = {"da", "rt", "dart"}
-VALID_COLS = set(configs.FEATURE_COLS)
+VALID_MARKETS = frozenset({"da", "rt", "dart"})
+VALID_COLS = frozenset(configs.FEATURE_COLS)
+
+# One comma-separated entry at a time; anchoring on the separators keeps a
+# malformed entry from matching partway through
+_WEIGHT_PATTERN = r"(?P<w>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+_FEATURE_RE = re.compile(
+    r"(?:^|,)\s*(?P<mkt>" + "|".join(sorted(VALID_MARKETS)) + r")\s*\.\s*(?P<col>\w+)\s*:\s*"
+    + _WEIGHT_PATTERN + r"\s*(?=,|$)",
+    re.IGNORECASE,
+)
+_FEATURE_WEIGHT_RE = re.compile(r"(?:^|,)\s*(?P<col>\w+)\s*:\s*" + _WEIGHT_PATTERN + r"\s*(?=,|$)")
 
 
 @app.get("/health")
@@ -33,7 +55,7 @@ def health():
     return {"status": "ok"}
 
 
-@app.post("/like-day")
+@app.post("/like-day", response_model=None, response_class=ORJSONResponse)
 def like_day(
     target_date: date | None = Query(default=None, description="Target date (YYYY-MM-DD). Defaults to tomorrow."),
     hub: str = Query(default="WESTERN HUB", description="PJM pricing hub"),
@@ -58,44 +80,23 @@ def like_day(
     days_list = [int(d) for d in days_of_week.split(",")] if days_of_week else None
     months_list = [int(m) for m in months.split(",")] if months else None
 
-    # Parse features param: market.column:weight format
+    # Parse features param: market.column:weight format (invalid entries are skipped)
     features_list: list[dict] | None = None
     if features:
-        features_list = []
-        for entry in features.split(","):
-            entry = entry.strip()
-            if ":" not in entry:
-                continue
-            spec, weight_str = entry.rsplit(":", 1)
-            if "." not in spec:
-                continue
-            mkt, col = spec.split(".", 1)
-            mkt = mkt.strip().lower()
-            col = col.strip()
-            if mkt in VALID_MARKETS and col in VALID_COLS:
-                try:
-                    features_list.append({"market": mkt, "column": col, "weight": float(weight_str)})
-                except ValueError:
-                    pass
-        if not features_list:
-            features_list = None
+        features_list = [
+            {"market": m.group("mkt").lower(), "column": m.group("col"), "weight": float(m.group("w"))}
+            for m in _FEATURE_RE.finditer(features)
+            if m.group("col") in VALID_COLS
+        ] or None
 
     # Backward compat: build features_list from deprecated params
     if features_list is None:
         if feature_weights:
-            features_list = []
-            for pair in feature_weights.split(","):
-                pair = pair.strip()
-                if ":" in pair:
-                    col, w = pair.split(":", 1)
-                    col = col.strip()
-                    if col in VALID_COLS:
-                        try:
-                            features_list.append({"market": market, "column": col, "weight": float(w)})
-                        except ValueError:
-                            pass
-            if not features_list:
-                features_list = None
+            features_list = [
+                {"market": market, "column": m.group("col"), "weight": float(m.group("w"))}
+                for m in _FEATURE_WEIGHT_RE.finditer(feature_weights)
+                if m.group("col") in VALID_COLS
+            ] or None
         elif feature_cols:
             cols = [c.strip() for c in feature_cols.split(",") if c.strip() in VALID_COLS]
             if cols:
@@ -119,38 +120,33 @@ def like_day(
             months=months_list,
         )
     except Exception as e:
-        logging.error(f"Like-day pipeline failed: {e}", exc_info=True)
+        logger.error("Like-day pipeline failed: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Pipeline error: {str(e)}")
 
-    like_days_df = output["like_days"]
-    hourly_df = output["hourly_profiles"]
-
-    # Convert date objects to strings for JSON serialization
-    like_days_records = like_days_df.copy()
-    like_days_records[configs.DATE_COL] = like_days_records[configs.DATE_COL].astype(str)
-
-    hourly_records = hourly_df.copy()
-    hourly_records[configs.DATE_COL] = hourly_records[configs.DATE_COL].astype(str)
-
-    return {
+    # Dates stay as datetime.date — orjson writes them as ISO strings. Returning the
+    # response directly skips FastAPI's jsonable_encoder pass over every record.
+    return ORJSONResponse({
         "target_date": str(target_date),
         "hub": hub,
         "metric": metric,
         "n_neighbors": n_neighbors,
-        "like_days": like_days_records.to_dict(orient="records"),
-        "hourly_profiles": hourly_records.to_dict(orient="records"),
-    }
+        "like_days": output["like_days"].to_dict(orient="records"),
+        "hourly_profiles": output["hourly_profiles"].to_dict(orient="records"),
+    })
 
 
 def _serialize_df(df: pd.DataFrame) -> list[dict]:
     """Serialize a DataFrame to JSON-safe records (NaN → None, dates → str)."""
-    df = df.copy()
+    # Map column by column and zip into records — the input frame is never copied
+    columns = {}
     for col in df.columns:
-        if pd.api.types.is_datetime64_any_dtype(df[col]):
-            df[col] = df[col].astype(str)
-        elif df[col].dtype == object:
-            df[col] = df[col].apply(lambda v: str(v) if isinstance(v, date) else v)
-    return df.where(df.notna(), None).to_dict(orient="records")
+        values = df[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.astype(str)
+        elif values.dtype == object:
+            values = values.map(lambda v: str(v) if isinstance(v, date) else v)
+        columns[col] = values.astype(object).where(values.notna(), None).tolist()
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
 
 
 @app.post("/like-day-forecast")
@@ -178,7 +174,7 @@ def like_day_forecast(
             weight_method=weight_method,
         )
     except Exception as e:
-        logging.error(f"Like-day forecast pipeline failed: {e}", exc_info=True)
+        logger.error("Like-day forecast pipeline failed: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Pipeline error: {str(e)}")
 
     if "error" in result:
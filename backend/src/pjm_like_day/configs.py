@@ -1,11 +1,11 @@
 from datetime import datetime, timedelta
 
-import logging
-logging.basicConfig(level=logging.DEBUG)
-
 SCHEMA: str = "dbt_pjm_v1_2026_feb_19"
 HUB: str = "WESTERN HUB"
 
+# How long pulled LMP data is reused in-process before re-querying the DB
+LMP_CACHE_TTL_SECONDS: int = 15 * 60
+
 DATE_COL: str = "date"
 HOUR_ENDING_COL: str = "hour_ending"
 
@@ -1,3 +1,5 @@
+import threading
+import time
 from pathlib import Path
 
 import pandas as pd
@@ -6,10 +8,41 @@ from src.utils.azure_postgresql import pull_from_db
 from src.pjm_like_day import configs
 
 import logging
-logging.basicConfig(level=logging.DEBUG)
+
+logger = logging.getLogger(__name__)
 
 SQL_DIR = Path(__file__).parent.parent / "sql"
 
+# Read once at import; hub/market are bound as query parameters, only the schema is formatted in
+with open(SQL_DIR / "pjm_lmps_hourly.sql", "r") as f:
+    _SQL_TEMPLATE = f.read()
+
+
+# (schema, hub, market) -> (ttl_bucket, df); one live entry per key, replaced when its bucket expires
+_PULL_CACHE: dict[tuple[str, str, str], tuple[int, pd.DataFrame]] = {}
+
+# One lock per key so concurrent requests missing at a bucket rollover share a single pull
+_PULL_LOCKS: dict[tuple[str, str, str], threading.Lock] = {}
+_PULL_LOCKS_GUARD = threading.Lock()
+
+
+def _pull_from_db(
+        schema: str,
+        hub: str,
+        market: str,
+    ) -> pd.DataFrame:
+
+    query = _SQL_TEMPLATE.format(schema=schema)
+    logger.info("Pulling LMP hourly data for %s (%s) from %s ...", hub, market, schema)
+
+    df = pull_from_db(query=query, params={"hub": hub, "market": market})
+    if df is None:
+        # Raise rather than return so the failure is not cached
+        raise RuntimeError(f"Failed to pull LMP hourly data for {hub} ({market}) from {schema}")
+    logger.info("Pulled %d rows", len(df))
+
+    return df
+
 
 def pull(
         schema: str = configs.SCHEMA,
@@ -17,15 +50,25 @@ def pull(
         market: str = "da",
     ) -> pd.DataFrame:
 
-    sql_file = SQL_DIR / "pjm_lmps_hourly.sql"
+    ttl_bucket = int(time.time() // configs.LMP_CACHE_TTL_SECONDS)
+    key = (schema, hub, market)
 
-    with open(sql_file, "r") as f:
-        query = f.read()
+    cached = _PULL_CACHE.get(key)
+    if cached is not None and cached[0] >= ttl_bucket:
+        df = cached[1]
+    else:
+        with _PULL_LOCKS_GUARD:
+            lock = _PULL_LOCKS.setdefault(key, threading.Lock())
+        with lock:
+            # Another thread may have refreshed the entry while we waited
+            cached = _PULL_CACHE.get(key)
+            if cached is not None and cached[0] >= ttl_bucket:
+                df = cached[1]
+            else:
+                # Drop the stale frame before pulling so two generations are never held at once
+                _PULL_CACHE.pop(key, None)
+                df = _pull_from_db(schema=schema, hub=hub, market=market)
+                _PULL_CACHE[key] = (ttl_bucket, df)
 
-    query = query.format(schema=schema, hub=hub, market=market)
-    logging.info(f"Pulling LMP hourly data for {hub} ({market}) from {schema} ...")
-
-    df = pull_from_db(query=query)
-    logging.info(f"Pulled {len(df):,} rows")
-
-    return df
+    # Return a copy so callers can mutate without corrupting the cache
+    return df.copy()
@@ -3,29 +3,75 @@ import pandas as pd
 
 from src.pjm_like_day import configs
 
-import logging
-logging.basicConfig(level=logging.DEBUG)
-
-
-def _compute_metric(diff: np.ndarray, metric: str,
-                    target_flat: np.ndarray | None = None,
-                    hist_flat: np.ndarray | None = None) -> float:
-    """Compute a single distance value from a diff array (or flat vectors for cosine)."""
-    if metric == "mae":
-        return float(np.abs(diff).mean())
-    elif metric == "rmse":
-        return float(np.sqrt((diff ** 2).mean()))
-    elif metric == "euclidean":
-        return float(np.sqrt((diff ** 2).sum()))
-    elif metric == "cosine":
-        if target_flat is None or hist_flat is None:
-            return float(np.abs(diff).mean())
-        denom = np.linalg.norm(target_flat) * np.linalg.norm(hist_flat)
-        if denom == 0:
-            return 1.0
-        return float(1.0 - np.dot(target_flat, hist_flat) / denom)
+
+def _stack_days(
+        df: pd.DataFrame,
+        feature_cols: list[str],
+        n_hours: int,
+        date_col: str = configs.DATE_COL,
+        hour_col: str = configs.HOUR_ENDING_COL,
+    ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Stack hourly rows into a dense feature-major (n_feats, n_days, n_hours) float32 tensor.
+
+    Each feature is one contiguous (n_days, n_hours) block. Days that do not
+    have exactly ``n_hours`` rows are dropped.
+
+    Returns:
+        (dates, tensor) — dates is an object array aligned with axis 1 of tensor.
+    """
+    if len(df) == 0:
+        return np.empty(0, dtype=object), np.empty((len(feature_cols), 0, n_hours), dtype=np.float32)
+
+    codes, dates = pd.factorize(df[date_col], sort=True)
+    hours = df[hour_col].to_numpy(dtype=np.int64)
+
+    # Order rows by (date, hour). Pipeline frames arrive pre-sorted, so the
+    # O(n) integer check usually lets us skip the argsort entirely.
+    key = codes * (hours.max() + 1) + hours
+    order = np.argsort(key, kind="stable") if np.any(key[1:] < key[:-1]) else slice(None)
+    codes = codes[order]
+
+    counts = np.bincount(codes, minlength=len(dates))
+    complete = counts == n_hours
+
+    rows = complete[codes]
+    tensor = np.stack([
+        df[col].to_numpy(dtype=np.float32)[order][rows].reshape(-1, n_hours)
+        for col in feature_cols
+    ])
+    return np.asarray(dates, dtype=object)[complete], tensor
+
+
+def _batch_distance(H: np.ndarray, T: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Distance from every historical day to the target, per feature, in one call.
+
+    Args:
+        H: History tensor of shape (n_feats, n_days, n_hours).
+        T: Target of shape (n_feats, n_hours).
+        metric: mae, rmse, euclidean, cosine (anything else falls back to mae).
+
+    Returns:
+        (n_days, n_feats) float32 array of raw distances.
+    """
+    if metric == "cosine":
+        # Row-wise products reduced over hours, like the norms below. Not a BLAS matvec: its
+        # blocking can round identical days differently, which breaks date-order ties
+        dots = (H * T[:, None, :]).sum(axis=2)
+        denom = np.sqrt((H * H).sum(axis=2)) * np.linalg.norm(T, axis=1)[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dist = 1.0 - dots / denom
+        dist = np.where(denom == 0, 1.0, dist)
     else:
-        return float(np.abs(diff).mean())
+        diff = H - T[:, None, :]
+        if metric == "rmse":
+            dist = np.sqrt((diff ** 2).mean(axis=2))
+        elif metric == "euclidean":
+            dist = np.sqrt((diff ** 2).sum(axis=2))
+        else:
+            dist = np.abs(diff).mean(axis=2)
+    return dist.T.astype(np.float32)
 
 
 def find_like_days(
@@ -44,6 +90,11 @@ def find_like_days(
     Supports multi-feature weighted ranking: computes per-feature distances,
     z-score normalizes across the historical pool, then blends with weights.
 
+    The search is deliberately brute force. The z-score step needs every
+    day's raw distance, so a BallTree/KD-tree query over the top few would not
+    reproduce the blended distances. A full vectorized scan of a multi-year
+    pool is a few milliseconds.
+
     Args:
         df_target: Hourly rows for the target date.
         df_hist: Hourly rows for all historical dates.
@@ -66,71 +117,71 @@ def find_like_days(
         weights = {col: 1.0 for col in feature_cols}
 
     # Target hourly values as array (sorted by hour)
-    target_sorted = df_target.sort_values(hour_col)
+    target_sorted = df_target if df_target[hour_col].is_monotonic_increasing else df_target.sort_values(hour_col)
     n_hours = len(target_sorted)
 
     if n_hours == 0:
         raise ValueError("Target date has no hourly data")
 
-    # Pre-compute target arrays per feature
-    target_per_feat = {}
-    for col in feature_cols:
-        target_per_feat[col] = target_sorted[col].values
+    T = np.ascontiguousarray(target_sorted[feature_cols].to_numpy(dtype=np.float32).T)  # (n_feats, n_hours)
 
     # --- Pass 1: compute raw per-feature distances for every historical day ---
-    raw_results = []  # list of {date_col: dt, feat1_dist: ..., feat2_dist: ..., ...}
-    for dt, group in df_hist.groupby(date_col):
-        hist_sorted = group.sort_values(hour_col)
-
-        # Only compare days with the exact same number of hours
-        if len(hist_sorted) != n_hours:
-            continue
-
-        row = {date_col: dt}
-        for col in feature_cols:
-            t_vals = target_per_feat[col]
-            h_vals = hist_sorted[col].values
-            diff = t_vals - h_vals
-            row[col] = _compute_metric(diff, metric, t_vals, h_vals)
+    # Only days with the exact same number of hours as the target are kept
+    dates, H = _stack_days(df_hist, feature_cols, n_hours, date_col, hour_col)  # (n_feats, n_days, n_hours)
 
-        raw_results.append(row)
+    # Early reject: a day with any missing value can never rank, so drop it before
+    # scoring rather than letting NaN distances leak into the pool statistics
+    finite = np.isfinite(H).all(axis=(0, 2))
+    if not finite.all():
+        dates, H = dates[finite], H[:, finite]
+    n_days = len(dates)
 
-    if not raw_results:
+    if n_days == 0:
         raise ValueError("No historical days matched the target hours")
 
-    raw_df = pd.DataFrame(raw_results)
+    raw = _batch_distance(H, T, metric)  # (n_days, n_feats)
 
     # --- Pass 2: z-score normalize per-feature distances, then weighted blend ---
-    weight_sum = sum(weights[col] for col in feature_cols)
-
-    # Compute mean/std for each feature's distances across the full historical pool
-    feat_stats = {}
-    for col in feature_cols:
-        mean = raw_df[col].mean()
-        std = raw_df[col].std()
-        if std == 0 or np.isnan(std):
-            std = 1.0  # avoid division by zero when all distances are identical
-        feat_stats[col] = (mean, std)
-
-    # Compute weighted normalized distance
-    raw_df["distance"] = 0.0
-    for col in feature_cols:
-        mean, std = feat_stats[col]
-        normalized = (raw_df[col] - mean) / std
-        raw_df["distance"] += weights[col] * normalized
-    raw_df["distance"] /= weight_sum
-
-    # Select top-N
-    results_df = raw_df.nsmallest(n_neighbors, "distance").reset_index(drop=True)
-    results_df["rank"] = np.arange(1, len(results_df) + 1)
+    w = np.array([weights[col] for col in feature_cols], dtype=np.float64)
+
+    # Mean/std of each feature's distances across the full historical pool (ddof=1, as pandas)
+    mu = raw.mean(axis=0)
+    sd = raw.std(axis=0, ddof=1) if n_days > 1 else np.ones_like(mu)
+    sd[(sd == 0) | np.isnan(sd)] = 1.0  # avoid division by zero when all distances are identical
+
+    # Weighted normalized distance
+    distance = ((raw - mu) / sd) @ w / w.sum()
+
+    # Select top-N: O(n) partition for the N-th distance, then everything below it plus the
+    # earliest days tied with it, so ties at the cut-off keep date order like nsmallest
+    n_select = max(min(n_neighbors, n_days), 0)
+    if n_select == 0:
+        idx = np.empty(0, dtype=np.intp)
+    elif n_select < n_days:
+        kth = np.partition(distance, n_select - 1)[n_select - 1]
+        below = np.flatnonzero(distance < kth)
+        tied = np.flatnonzero(distance == kth)[:n_select - len(below)]
+        idx = np.concatenate([below, tied])
+    else:
+        idx = np.arange(n_days)
+    idx = idx[np.lexsort((idx, distance[idx]))]
+
+    top = distance[idx]
 
     # Similarity: normalise relative to the worst of the N neighbors
-    max_dist = results_df["distance"].max()
-    min_dist = results_df["distance"].min()
-    dist_range = max_dist - min_dist
-    if dist_range > 0:
-        results_df["similarity"] = 1.0 - (results_df["distance"] - min_dist) / dist_range
+    if n_select == 0:
+        similarity = top
     else:
-        results_df["similarity"] = 1.0
-
-    return results_df[[date_col, "rank", "distance", "similarity"]]
+        min_dist = top.min()
+        dist_range = top.max() - min_dist
+        if dist_range > 0:
+            similarity = 1.0 - (top - min_dist) / dist_range
+        else:
+            similarity = np.ones_like(top)
+
+    return pd.DataFrame({
+        date_col: dates[idx],
+        "rank": np.arange(1, n_select + 1),
+        "distance": top,
+        "similarity": similarity,
+    })
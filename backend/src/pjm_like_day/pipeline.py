@@ -1,6 +1,7 @@
 from datetime import date, datetime, timedelta
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 from tabulate import tabulate
 
@@ -9,24 +10,56 @@ from src.pjm_like_day.data import lmps
 from src.pjm_like_day.like_day import find_like_days
 
 import logging
-logging.basicConfig(level=logging.DEBUG)
+
+logger = logging.getLogger(__name__)
 
 
 LMP_COLS = configs.FEATURE_COLS  # ["lmp_total", "lmp_system_energy_price", ...]
 
+# datetime64 copy of DATE_COL, parsed once at pull time for the dow/month filters
+DATE_TS_COL = "_date_ts"
+JOIN_KEYS = [configs.DATE_COL, configs.HOUR_ENDING_COL, DATE_TS_COL]
+
+
+def _pull_and_prefix(
+        hub: str,
+        market: str,
+        columns: list[str] = LMP_COLS,
+        prefix: bool = True,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Pull LMP data for a market and prefix columns with market name.
+
+    Args:
+        hub: PJM pricing hub.
+        market: Market to pull (da, rt, dart).
+        columns: LMP columns to carry into the join-ready frame.
+        prefix: Prefix LMP columns with the market name. Skipped when only one
+                market is used, since there is nothing to disambiguate.
+
+    Returns:
+        (df_full, df_prefixed) — the full pull with all hours and original
+        column names, and the join-ready frame with (optionally prefixed) LMP columns.
+    """
+    df_full = lmps.pull(hub=hub, market=market)
+    date_ts = pd.to_datetime(df_full[configs.DATE_COL])
+    df_full[configs.DATE_COL] = date_ts.dt.date
 
-def _pull_and_prefix(hub: str, market: str) -> pd.DataFrame:
-    """Pull LMP data for a market and prefix columns with market name."""
-    df = lmps.pull(hub=hub, market=market)
-    df[configs.DATE_COL] = pd.to_datetime(df[configs.DATE_COL]).dt.date
+    # Select before renaming so only the needed columns are copied
+    lmp_cols = [c for c in dict.fromkeys(columns) if c in df_full.columns]
+    df = df_full[[configs.DATE_COL, configs.HOUR_ENDING_COL] + lmp_cols].assign(**{DATE_TS_COL: date_ts})
+
+    # Sort once so every later boolean filter keeps (date, hour) order for find_like_days
+    df = df.sort_values([DATE_TS_COL, configs.HOUR_ENDING_COL], kind="mergesort", ignore_index=True)
 
     # Prefix LMP columns: lmp_total → da_lmp_total
-    rename_map = {col: f"{market}_{col}" for col in LMP_COLS}
+    rename_map = {col: f"{market}_{col}" if prefix else col for col in lmp_cols}
     df = df.rename(columns=rename_map)
 
-    # Keep only date, hour_ending, and prefixed columns
-    keep = [configs.DATE_COL, configs.HOUR_ENDING_COL] + list(rename_map.values())
-    return df[[c for c in keep if c in df.columns]]
+    # float32 is ample for $/MWh and halves memory traffic in the distance path
+    df = df.astype({col: np.float32 for col in rename_map.values()})
+
+    return df_full, df
 
 
 def run(
@@ -68,63 +101,85 @@ def run(
 
     # 1. Determine unique markets needed
     unique_markets = sorted(set(f["market"] for f in features))
-    logging.info(f"Markets to pull: {unique_markets}")
+    logger.info("Markets to pull: %s", unique_markets)
+
+    # Fast path: a single feature needs no market prefixes (and no join below)
+    single_feature = len(features) == 1
 
     # 2. Pull and join data from each market (prefixed columns)
+    # Unfiltered pulls are kept so step 10 can serve full-day profiles without re-pulling
+    per_market_unfiltered: dict[str, pd.DataFrame] = {}
     dfs = []
     for mkt in unique_markets:
-        df_mkt = _pull_and_prefix(hub=hub, market=mkt)
+        df_full, df_mkt = _pull_and_prefix(
+            hub=hub,
+            market=mkt,
+            columns=[f["column"] for f in features if f["market"] == mkt],
+            prefix=not single_feature,
+        )
+        per_market_unfiltered[mkt] = df_full
         dfs.append(df_mkt)
 
-    # Join on (date, hour_ending) — inner join keeps only dates present in ALL markets
-    df = dfs[0]
-    for df_mkt in dfs[1:]:
-        df = df.merge(df_mkt, on=[configs.DATE_COL, configs.HOUR_ENDING_COL], how="inner")
+    # Join on (date, hour_ending) — inner join keeps only dates present in ALL markets.
+    # A list join aligns every market in a single concat pass (merge only if keys repeat).
+    if len(dfs) == 1:
+        df = dfs[0]
+    else:
+        dfs_idx = [d.set_index(JOIN_KEYS).sort_index() for d in dfs]
+        df = dfs_idx[0].join(dfs_idx[1:], how="inner").reset_index()
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Joined data: %d rows, %d dates", len(df), df[configs.DATE_COL].nunique())
 
-    logging.info(f"Joined data: {len(df)} rows, {df[configs.DATE_COL].nunique()} dates")
+    # 3-7. Build boolean masks from the date/hour columns and slice df once per split,
+    # without mutating or copying intermediate frames
+    day = df[DATE_TS_COL].to_numpy().astype("datetime64[D]")
+    target_day = np.datetime64(target_date, "D")
 
     # 3. Filter hours (applied to both target and historical for consistent feature vectors)
+    hour_mask = np.ones(len(df), dtype=bool)
     if hours is not None:
-        df = df[df[configs.HOUR_ENDING_COL].isin(hours)]
-        logging.info(f"Filtered to {len(hours)} hours: {hours}")
+        hour_mask = np.isin(df[configs.HOUR_ENDING_COL].to_numpy(), hours)
+        logger.info("Filtered to %d hours: %s", len(hours), hours)
 
     # 4. Split target vs historicals
-    df_target = df[df[configs.DATE_COL] == target_date]
-    df_hist = df[df[configs.DATE_COL] < target_date]
+    target_mask = hour_mask & (day == target_day)
+    hist_mask = hour_mask & (day < target_day)
 
     # 5. Filter historical pool by date range
     if hist_start is not None:
-        df_hist = df_hist[df_hist[configs.DATE_COL] >= hist_start]
-        logging.info(f"Historical start filter: >= {hist_start}")
+        hist_mask &= day >= np.datetime64(hist_start, "D")
+        logger.info("Historical start filter: >= %s", hist_start)
     if hist_end is not None:
-        df_hist = df_hist[df_hist[configs.DATE_COL] <= hist_end]
-        logging.info(f"Historical end filter: <= {hist_end}")
+        hist_mask &= day <= np.datetime64(hist_end, "D")
+        logger.info("Historical end filter: <= %s", hist_end)
 
     # 6. Filter historical pool by day of week (0=Sun..6=Sat)
     if days_of_week is not None:
-        df_hist["_dow"] = pd.to_datetime(df_hist[configs.DATE_COL]).dt.dayofweek
-        # pandas dayofweek: 0=Mon..6=Sun → convert to 0=Sun..6=Sat
-        df_hist["_dow"] = (df_hist["_dow"] + 1) % 7
-        df_hist = df_hist[df_hist["_dow"].isin(days_of_week)]
-        df_hist = df_hist.drop(columns=["_dow"])
-        logging.info(f"Filtered to days of week: {days_of_week}")
+        # Days since 1970-01-01 (a Thursday) give the 0=Sun..6=Sat index directly
+        dow = (day.astype(np.int64) + 4) % 7
+        hist_mask &= np.isin(dow, days_of_week)
+        logger.info("Filtered to days of week: %s", days_of_week)
 
     # 7. Filter historical pool by month
     if months is not None:
-        df_hist["_month"] = pd.to_datetime(df_hist[configs.DATE_COL]).dt.month
-        df_hist = df_hist[df_hist["_month"].isin(months)]
-        df_hist = df_hist.drop(columns=["_month"])
-        logging.info(f"Filtered to months: {months}")
+        month = day.astype("datetime64[M]").astype(np.int64) % 12 + 1
+        hist_mask &= np.isin(month, months)
+        logger.info("Filtered to months: %s", months)
 
-    logging.info(f"Target date: {target_date}  ({len(df_target)} rows)")
-    logging.info(f"Historical dates: {df_hist[configs.DATE_COL].nunique()} days")
+    df_target = df[target_mask]
+    df_hist = df[hist_mask]
+
+    logger.info("Target date: %s  (%d rows)", target_date, len(df_target))
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Historical dates: %d days", df_hist[configs.DATE_COL].nunique())
 
     # 8. Build feature_weights dict with prefixed column names
     feature_weights = {
-        f"{f['market']}_{f['column']}": f["weight"]
+        f["column"] if single_feature else f"{f['market']}_{f['column']}": f["weight"]
         for f in features
     }
-    logging.info(f"Feature weights: {feature_weights}")
+    logger.info("Feature weights: %s", feature_weights)
 
     # 9. Find like days
     results = find_like_days(
@@ -140,12 +195,10 @@ def run(
     all_dates = like_dates + [target_date]
 
     profiles = []
-    for mkt in unique_markets:
-        df_full = lmps.pull(hub=hub, market=mkt)
-        df_full[configs.DATE_COL] = pd.to_datetime(df_full[configs.DATE_COL]).dt.date
-        df_full = df_full[df_full[configs.DATE_COL].isin(all_dates)].copy()
-        df_full["market"] = mkt
-        profiles.append(df_full)
+    for mkt, df_full in per_market_unfiltered.items():
+        df_profile = df_full[df_full[configs.DATE_COL].isin(all_dates)].copy()
+        df_profile["market"] = mkt
+        profiles.append(df_profile)
 
     hourly_profiles = pd.concat(profiles, ignore_index=True) if profiles else pd.DataFrame()
 
@@ -10,5 +10,5 @@ select
 from {schema}.staging_v1_pjm_lmps_hourly
 
 WHERE
-    hub = '{hub}'
-    AND market = '{market}'
\ No newline at end of file
+    hub = %(hub)s
+    AND market = %(market)s
\ No newline at end of file
@@ -9,7 +9,7 @@ logging.getLogger().handlers[0].setLevel(logging.DEBUG)
 
 # Get the directory where this config file lives
 CONFIG_DIR = Path(__file__).parent
-logging.info(f"CONFIG_DIR: {CONFIG_DIR}")
+logging.info("CONFIG_DIR: %s", CONFIG_DIR)
 load_dotenv(dotenv_path=CONFIG_DIR / ".env", override=False)
 
 #===============================================
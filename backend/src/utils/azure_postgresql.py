@@ -14,10 +14,7 @@ import psycopg2
 import warnings
 warnings.simplefilter(action='ignore', category=Warning)
 
-# init logging
 import logging
-logging.basicConfig(level=logging.DEBUG)
-logging.getLogger().handlers[0].setLevel(logging.DEBUG)
 
 from src import (
     settings
@@ -45,6 +42,7 @@ def _connect_to_azure_postgressql(
 def pull_from_db(
         query: str,
         database: str = settings.AZURE_POSTGRESQL_DB_NAME,
+        params: dict | None = None,
     ) -> pd.DataFrame:
 
     try: 
@@ -53,7 +51,7 @@ def pull_from_db(
         
         # Execute the query and fetch the data
         # logging.info(query)
-        df = pd.read_sql(query, connection)
+        df = pd.read_sql(query, connection, params=params)
         # logging.info(f"Pulled {len(df):,} rows ...")
 
         # close connection
@@ -1,14 +1,30 @@
+import asyncio
+import gzip
+import importlib.util
+import io
 import logging
 import os
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Union
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Union
 
 import pandas as pd
-from tabulate import tabulate
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import (
+    ConnectionErrorRetryHandler,
+    RateLimitErrorRetryHandler,
+)
+
+# aiohttp is an optional slack_sdk extra; the async senders import it (and the async
+# clients) on first use so sync-only callers neither need it nor pay for the import
+if TYPE_CHECKING:
+    import aiohttp
+    from slack_sdk.web.async_client import AsyncWebClient
 
 from helioscta_api_scrapes.utils import (
     file_utils,
@@ -21,6 +37,107 @@ from helioscta_api_scrapes import (
 """
 """
 
+# channel name -> id lookups, keyed by (token, channel_name); values are (channel_id, fetched_at).
+# A channel_id of None records a name that was not found, kept for the shorter TTL.
+CHANNEL_ID_CACHE_TTL_SECONDS: int = 60 * 60
+CHANNEL_NOT_FOUND_TTL_SECONDS: int = 5 * 60
+_CHANNEL_ID_CACHE: Dict[tuple, tuple] = {}
+
+# pooled session for webhook posts. Only retries where Slack cannot have accepted the
+# message yet (connect errors and 429s, honouring Retry-After): retrying a POST after a
+# read timeout or 5xx could post the notification twice.
+_WEBHOOK_SESSION = requests.Session()
+_WEBHOOK_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            read=0,
+            other=0,
+            backoff_factor=0.5,
+            status_forcelist=[429],
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    ),
+)
+WEBHOOK_TIMEOUT_SECONDS: int = 10
+
+# Slack client retry policy, shared by every client built below
+RATE_LIMIT_MAX_RETRIES: int = 5
+CONNECTION_ERROR_MAX_RETRIES: int = 3
+
+
+def _retry_handlers() -> list:
+    """Retry handlers for the sync WebClient: 429s (honouring Retry-After) and connection errors."""
+    return [
+        RateLimitErrorRetryHandler(max_retry_count=RATE_LIMIT_MAX_RETRIES),
+        ConnectionErrorRetryHandler(max_retry_count=CONNECTION_ERROR_MAX_RETRIES),
+    ]
+
+
+def _async_retry_handlers(connect_only: bool = False) -> list:
+    """
+    Retry handlers for the async clients.
+
+    connect_only restricts connection retries to failures to connect at all
+    (aiohttp.ClientConnectorError). Use it for webhooks: a disconnect or reset after the
+    request was sent may follow Slack accepting it, and retrying would post it twice
+    (the sync webhook session's Retry(read=0, other=0) follows the same rule).
+    """
+    from slack_sdk.http_retry.builtin_async_handlers import (
+        AsyncConnectionErrorRetryHandler,
+        AsyncRateLimitErrorRetryHandler,
+    )
+
+    connection_kwargs = {"max_retry_count": CONNECTION_ERROR_MAX_RETRIES}
+    if connect_only:
+        import aiohttp
+        connection_kwargs["error_types"] = [aiohttp.ClientConnectorError]
+    return [
+        AsyncRateLimitErrorRetryHandler(max_retry_count=RATE_LIMIT_MAX_RETRIES),
+        AsyncConnectionErrorRetryHandler(**connection_kwargs),
+    ]
+
+
+GZIP_CHUNK_BYTES: int = 1024 * 1024
+
+# prefer xlsxwriter for Excel uploads; checked without importing either engine
+EXCEL_ENGINE: str = "xlsxwriter" if importlib.util.find_spec("xlsxwriter") else "openpyxl"
+
+_tabulate = None
+
+
+def _get_tabulate():
+    """Import tabulate on first use (only send_dataframe with an explicit tablefmt needs it)."""
+    global _tabulate
+    if _tabulate is None:
+        from tabulate import tabulate
+        _tabulate = tabulate
+    return _tabulate
+
+
+def _gzip_file(file_path: Union[str, Path], compresslevel: int = 6) -> bytes:
+    """Gzip a file into memory, reading it in GZIP_CHUNK_BYTES chunks."""
+    buf = io.BytesIO()
+    with open(file_path, 'rb') as src, gzip.GzipFile(fileobj=buf, mode='wb', compresslevel=compresslevel) as gz:
+        while chunk := src.read(GZIP_CHUNK_BYTES):
+            gz.write(chunk)
+    return buf.getvalue()
+
+
+def invalidate_channel_cache(token: Optional[str] = None) -> None:
+    """Drop cached channel IDs (for a single token, or all of them)."""
+    if token is None:
+        _CHANNEL_ID_CACHE.clear()
+        return
+    for key in [key for key in _CHANNEL_ID_CACHE if key[0] == token]:
+        del _CHANNEL_ID_CACHE[key]
+
+
 class SlackClient:
     """Client for Slack messaging operations."""
     
@@ -33,21 +150,58 @@ class SlackClient:
         self.token = token
         self.default_channel_name = default_channel_name
         self.default_webhook_url = default_webhook_url
+        self._client: Optional[WebClient] = None
+        self._async_client: Optional["AsyncWebClient"] = None
+        self._aiohttp_session: Optional["aiohttp.ClientSession"] = None
+        self._session_users: int = 0
     
     def get_client(self) -> WebClient:
-        """Get a Slack WebClient instance."""
-        return WebClient(token=self.token)
+        """Get the Slack WebClient for this instance (created once, so its connection is reused)."""
+        if self._client is None:
+            # sleeps through 429s (honouring Retry-After) and transient connection errors
+            self._client = WebClient(
+                token=self.token,
+                retry_handlers=_retry_handlers(),
+            )
+        return self._client
     
     def get_channel_id(self, channel_name: str) -> Optional[str]:
-        """Get channel ID from channel name."""
-        client = self.get_client()
+        """Get channel ID from channel name.
+
+        Only needed for files_upload_v2; chat_postMessage takes the name as-is. Cached per
+        (token, channel_name) for CHANNEL_ID_CACHE_TTL_SECONDS. On a miss every page of
+        conversations_list is walked once and all channels seen are cached; a name that is
+        not found is cached as missing for CHANNEL_NOT_FOUND_TTL_SECONDS.
+        """
         channel_name = channel_name.lstrip('#')
+        now = time.monotonic()
+
+        cached = _CHANNEL_ID_CACHE.get((self.token, channel_name))
+        if cached:
+            ttl = CHANNEL_ID_CACHE_TTL_SECONDS if cached[0] is not None else CHANNEL_NOT_FOUND_TTL_SECONDS
+            if now - cached[1] < ttl:
+                return cached[0]
+
+        client = self.get_client()
         
         try:
-            response = client.conversations_list(types="public_channel,private_channel")
-            for channel in response['channels']:
-                if channel['name'] == channel_name:
-                    return channel['id']
+            cursor = None
+            while True:
+                response = client.conversations_list(
+                    types="public_channel,private_channel",
+                    limit=1000,
+                    cursor=cursor,
+                )
+                for channel in response['channels']:
+                    _CHANNEL_ID_CACHE[(self.token, channel['name'])] = (channel['id'], now)
+                cursor = (response.get('response_metadata') or {}).get('next_cursor')
+                if not cursor:
+                    break
+
+            cached = _CHANNEL_ID_CACHE.get((self.token, channel_name))
+            if cached and cached[1] == now:
+                return cached[0]
+            _CHANNEL_ID_CACHE[(self.token, channel_name)] = (None, now)
             logging.warning(f"Channel '{channel_name}' not found")
             return None
         
@@ -55,6 +209,16 @@ class SlackClient:
             logging.error(f"Error finding channel: {e.response['error']}")
             return None
 
+    def resolve_channel_id(
+        self,
+        channel_name: Optional[str] = None,
+        channel_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """Return `channel_id` if given, else the (TTL-cached) ID for `channel_name`."""
+        if channel_id:
+            return channel_id
+        return self.get_channel_id(channel_name=channel_name or self.default_channel_name)
+
     def send_message(
         self,
         message: str,
@@ -66,6 +230,7 @@ class SlackClient:
         client = self.get_client()
         channel_name = channel_name or self.default_channel_name
         
+        # chat_postMessage resolves names itself, so no conversations_list lookup here
         try:
             response = client.chat_postMessage(
                 channel=channel_name,
@@ -95,7 +260,7 @@ class SlackClient:
             payload["blocks"] = blocks
         
         try:
-            response = requests.post(url, json=payload)
+            response = _WEBHOOK_SESSION.post(url, json=payload, timeout=WEBHOOK_TIMEOUT_SECONDS)
             response.raise_for_status()
             logging.info("Webhook message sent successfully")
             return {"ok": True, "response": response.text}
@@ -103,6 +268,135 @@ class SlackClient:
             logging.error(f"Error posting webhook message: {str(e)}")
             raise
 
+    async def __aenter__(self) -> "SlackClient":
+        """Keep one aiohttp session open for every async send inside `async with client:`."""
+        await self._acquire_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self._release_session()
+
+    async def _acquire_session(self) -> "aiohttp.ClientSession":
+        """
+        Get the aiohttp session shared by the async senders.
+
+        Reference counted: it is opened by the first concurrent user and closed when the
+        last one releases it, so no session outlives the calls (or `async with`) using it.
+        """
+        if self._aiohttp_session is None:
+            import aiohttp
+            self._aiohttp_session = aiohttp.ClientSession()
+        self._session_users += 1
+        return self._aiohttp_session
+
+    async def _release_session(self) -> None:
+        self._session_users -= 1
+        if self._session_users <= 0:
+            await self.aclose()
+
+    def _get_async_client(self, session: "aiohttp.ClientSession") -> "AsyncWebClient":
+        """Get a Slack AsyncWebClient backed by the given (current) session."""
+        if self._async_client is None:
+            from slack_sdk.web.async_client import AsyncWebClient
+            self._async_client = AsyncWebClient(
+                token=self.token,
+                session=session,
+                retry_handlers=_async_retry_handlers(),
+            )
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Close the shared aiohttp session."""
+        session = self._aiohttp_session
+        self._aiohttp_session = None
+        self._async_client = None
+        self._session_users = 0
+        if session is not None and not session.closed:
+            await session.close()
+
+    async def send_message_async(
+        self,
+        message: str,
+        channel_name: Optional[str] = None,
+        blocks: Optional[List[Dict]] = None,
+        thread_ts: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Send a message to a Slack channel (async)."""
+        session = await self._acquire_session()
+        client = self._get_async_client(session)
+        channel_name = channel_name or self.default_channel_name
+
+        try:
+            response = await client.chat_postMessage(
+                channel=channel_name,
+                text=message,
+                blocks=blocks,
+                thread_ts=thread_ts,
+            )
+            return response
+        except SlackApiError as e:
+            logging.error(f"Error posting message: {e.response['error']}")
+            raise
+        finally:
+            await self._release_session()
+
+    async def send_webhook_message_async(
+        self,
+        text: str,
+        blocks: Optional[List[Dict]] = None,
+        webhook_url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Send a message via webhook (async)."""
+        url = webhook_url or self.default_webhook_url
+
+        if not url:
+            raise ValueError("webhook_url must be provided either in config or as argument")
+
+        import aiohttp
+        from slack_sdk.webhook.async_client import AsyncWebhookClient
+
+        session = await self._acquire_session()
+        webhook = AsyncWebhookClient(
+            url=url,
+            session=session,
+            retry_handlers=_async_retry_handlers(connect_only=True),
+        )
+
+        try:
+            response = await webhook.send(text=text, blocks=blocks)
+        except aiohttp.ClientError as e:
+            logging.error(f"Error posting webhook message: {str(e)}")
+            raise
+        finally:
+            await self._release_session()
+
+        if response.status_code != 200:
+            logging.error(f"Error posting webhook message: {response.status_code} {response.body}")
+            raise RuntimeError(f"Webhook returned {response.status_code}: {response.body}")
+
+        logging.info("Webhook message sent successfully")
+        return {"ok": True, "response": response.body}
+
+    async def send_many(
+        self,
+        messages: List[Dict[str, Any]],
+        webhook: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Send several messages concurrently.
+
+        Each entry holds the keyword arguments for send_message_async (or
+        send_webhook_message_async when webhook=True). Results come back in input order.
+        All sends share one session, closed before returning unless the client is already
+        held open by `async with client:`.
+        """
+        send = self.send_webhook_message_async if webhook else self.send_message_async
+        await self._acquire_session()
+        try:
+            return await asyncio.gather(*(send(**kwargs) for kwargs in messages))
+        finally:
+            await self._release_session()
+
     def send_success_message(
         self,
         job_name: str,
@@ -110,8 +404,9 @@ class SlackClient:
         message: Optional[str] = None,
         channel_name: Optional[str] = None,
         include_metadata: bool = True,
-    ) -> Dict[str, Any]:
-        """Send a success notification."""
+        buffer: Optional["SlackMessageBuffer"] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Send a success notification (or append it to `buffer` to be sent on flush)."""
         default_message = f"✅ *Success*: `{job_name}` completed successfully"
         final_message = message or default_message
         
@@ -122,6 +417,9 @@ class SlackClient:
             ]
             final_message = "\n".join(metadata_lines)
         
+        if buffer is not None:
+            buffer.append(final_message, channel_name=channel_name)
+            return None
         return self.send_message(message=final_message, channel_name=channel_name)
     
     def send_failure_message(
@@ -153,9 +451,13 @@ class SlackClient:
         job_name: str,
         message: str,
         channel_name: Optional[str] = None,
-    ) -> Dict[str, Any]:
-        """Send a warning notification."""
+        buffer: Optional["SlackMessageBuffer"] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Send a warning notification (or append it to `buffer` to be sent on flush)."""
         warning_message = f"⚠️ *Warning*: `{job_name}`\n{message}"
+        if buffer is not None:
+            buffer.append(warning_message, channel_name=channel_name)
+            return None
         return self.send_message(message=warning_message, channel_name=channel_name)
     
     def send_metric_alert(
@@ -166,8 +468,9 @@ class SlackClient:
         threshold: float,
         comparison: str = "greater than",
         channel_name: Optional[str] = None,
-    ) -> Dict[str, Any]:
-        """Send a metric alert notification."""
+        buffer: Optional["SlackMessageBuffer"] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Send a metric alert notification (or append it to `buffer` to be sent on flush)."""
         message = (
             f"🚨 *Metric Alert*: `{job_name}`\n"
             f"• Metric: {metric_name}\n"
@@ -175,16 +478,22 @@ class SlackClient:
             f"• Threshold: {threshold:,.2f} ({comparison})"
         )
         
+        if buffer is not None:
+            buffer.append(message, channel_name=channel_name)
+            return None
         return self.send_message(message=message, channel_name=channel_name)
 
     def send_dataframe(
         self,
         df: pd.DataFrame,
-        tablefmt: str = 'simple',
+        tablefmt: Optional[str] = None,
         channel_name: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Send a DataFrame as a formatted table."""
-        table = tabulate(df, headers='keys', tablefmt=tablefmt, showindex=False)        
+        """Send a DataFrame as a formatted table (pandas' to_string unless a tabulate tablefmt is given)."""
+        if tablefmt is None:
+            table = df.to_string(index=False, max_colwidth=None)
+        else:
+            table = _get_tabulate()(df, headers='keys', tablefmt=tablefmt, showindex=False)
         message = f"```\n{table}\n```"
         return self.send_message(message=message, channel_name=channel_name)
 
@@ -196,33 +505,29 @@ class SlackClient:
         sheet_name: str = "Sheet1",
         title: Optional[str] = None,
         initial_comment: Optional[str] = None,
+        channel_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Send a DataFrame as an Excel file to Slack."""
-        import tempfile
-        
+        """Send a DataFrame as an Excel file to Slack (`channel_id`, if known, skips the name lookup)."""
         client = self.get_client()
-        channel_name = channel_name or self.default_channel_name
-        channel_id = self.get_channel_id(channel_name=channel_name)
+        channel_id = self.resolve_channel_id(channel_name=channel_name, channel_id=channel_id)
         
         if not filename.endswith('.xlsx'):
             filename = f"{filename}.xlsx"
         
-        tmp_path = None
         try:
-            with tempfile.NamedTemporaryFile(mode='wb', suffix='.xlsx', delete=False) as tmp_file:
-                tmp_path = tmp_file.name
-                
-                with pd.ExcelWriter(tmp_path, engine='openpyxl') as writer:
-                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+            # xlsxwriter streams the XML instead of building openpyxl's object tree. Not
+            # constant_memory: pandas writes cells column by column, which that mode drops.
+            buf = io.BytesIO()
+            with pd.ExcelWriter(buf, engine=EXCEL_ENGINE) as writer:
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
             
-            with open(tmp_path, 'rb') as file_content:
-                response = client.files_upload_v2(
-                    channel=channel_id,
-                    file=file_content,
-                    filename=filename,
-                    title=title or filename,
-                    initial_comment=initial_comment,
-                )
+            response = client.files_upload_v2(
+                channel=channel_id,
+                content=buf.getvalue(),
+                filename=filename,
+                title=title or filename,
+                initial_comment=initial_comment,
+            )
             
             logging.info(f"Excel file '{filename}' uploaded to {channel_id}")
             return response
@@ -230,9 +535,6 @@ class SlackClient:
         except SlackApiError as e:
             logging.error(f"Error uploading Excel file: {e.response['error']}")
             raise
-        finally:
-            if tmp_path and os.path.exists(tmp_path):
-                os.unlink(tmp_path)
 
     def send_file(
         self,
@@ -241,23 +543,39 @@ class SlackClient:
         filename: Optional[str] = None,
         title: Optional[str] = None,
         initial_comment: Optional[str] = None,
+        compress: bool = False,
+        channel_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Send a file to Slack."""
+        """
+        Send a file to Slack (gzipped in memory as `<filename>.gz` when compress=True).
+
+        `channel_id`, if known, skips the channel name lookup.
+        """
         client = self.get_client()
-        channel_name = channel_name or self.default_channel_name
-        channel_id = self.get_channel_id(channel_name=channel_name)
+        channel_id = self.resolve_channel_id(channel_name=channel_name, channel_id=channel_id)
         
         filename = filename or os.path.basename(file_path)
+        if compress and not filename.endswith('.gz'):
+            filename = f"{filename}.gz"
         
         try:
-            with open(file_path, 'rb') as file_content:
+            if compress:
                 response = client.files_upload_v2(
                     channel=channel_id,
-                    file=file_content,
+                    content=_gzip_file(file_path),
                     filename=filename,
                     title=title or filename,
                     initial_comment=initial_comment,
                 )
+            else:
+                with open(file_path, 'rb') as file_content:
+                    response = client.files_upload_v2(
+                        channel=channel_id,
+                        file=file_content,
+                        filename=filename,
+                        title=title or filename,
+                        initial_comment=initial_comment,
+                    )
             
             logging.info(f"File '{filename}' uploaded to {channel_id}")
             return response
@@ -267,6 +585,87 @@ class SlackClient:
             raise
 
 
+class SlackMessageBuffer:
+    """
+    Collect messages and post them as few chat_postMessage calls as possible.
+
+    Messages are queued per channel (`channel_name` on append, else the buffer's, else the
+    client's default) and joined with newlines into chunks of at most `max_chars` (Slack's
+    text limit), splitting on newlines. Sent on flush() or when used as a context manager,
+    on exit.
+    """
+
+    def __init__(
+        self,
+        client: SlackClient,
+        channel_name: Optional[str] = None,
+        max_chars: int = 4000,
+    ):
+        self.client = client
+        self.channel_name = channel_name
+        self.max_chars = max_chars
+        self._messages: Dict[Optional[str], List[str]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(messages) for messages in self._messages.values())
+
+    def __enter__(self) -> "SlackMessageBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+            return
+        # still try to get the queued alerts out, but never mask the original exception
+        try:
+            self.flush()
+        except Exception as e:
+            logging.error(f"Error flushing Slack message buffer: {e}")
+
+    def append(self, text: str, channel_name: Optional[str] = None) -> None:
+        """Queue a message for the next flush."""
+        self._messages.setdefault(channel_name or self.channel_name, []).append(text)
+
+    def _chunks(self, messages: List[str]) -> List[str]:
+        chunks: List[str] = []
+        current: List[str] = []
+        size = 0
+        for line in "\n".join(messages).split("\n"):
+            # hard-split any single line longer than the limit
+            pieces = [line[i:i + self.max_chars] for i in range(0, len(line), self.max_chars)] or [""]
+            for piece in pieces:
+                added = len(piece) + (1 if current else 0)
+                if current and size + added > self.max_chars:
+                    chunks.append("\n".join(current))
+                    current, size = [], 0
+                    added = len(piece)
+                current.append(piece)
+                size += added
+        if current:
+            chunks.append("\n".join(current))
+        # chat_postMessage rejects empty text (no_text)
+        return [chunk for chunk in chunks if chunk.strip()]
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """
+        Send everything queued so far.
+
+        Chunks are dropped from the buffer only once posted; if a post raises, it and the
+        chunks after it stay queued for the next flush.
+        """
+        responses = []
+        for channel_name in list(self._messages):
+            chunks = self._chunks(self._messages[channel_name])
+            for i, chunk in enumerate(chunks):
+                try:
+                    responses.append(self.client.send_message(message=chunk, channel_name=channel_name))
+                except Exception:
+                    self._messages[channel_name] = chunks[i:]
+                    raise
+            del self._messages[channel_name]
+        return responses
+
+
 def send_pipeline_failure_with_log(
     job_name: str,
     error: Exception,
@@ -298,6 +697,7 @@ def send_pipeline_failure_with_log(
                     file_path=str(log_path),
                     channel_name=channel_name,
                     initial_comment=message,
+                    compress=True,
                 )
             except Exception as e:
                 logging.error(f"Failed to upload log file: {e}")
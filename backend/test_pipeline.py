@@ -5,6 +5,9 @@ Run inside the backend container:
 
 Or locally (with .env vars set):
     cd backend && python test_pipeline.py
+
+lmps.pull is cached in-process (per hub/market, LMP_CACHE_TTL_SECONDS), so the
+raw-data check and every run() below share a single DB round-trip.
 """
 from datetime import date
 import numpy as np
@@ -20,6 +23,7 @@ from src.pjm_like_day.pipeline import run
 TARGET = date(2026, 2, 23)
 HUB = "WESTERN HUB"
 MARKET = "da"
+FEATURES = [{"market": MARKET, "column": "lmp_total", "weight": 1.0}]
 
 
 def test_data_shape():
@@ -29,17 +33,19 @@ def test_data_shape():
     print("=" * 60)
 
     df = lmps.pull(hub=HUB, market=MARKET)
-    df[configs.DATE_COL] = pd.to_datetime(df[configs.DATE_COL]).dt.date
+    df[configs.DATE_COL] = pd.to_datetime(df[configs.DATE_COL]).values.astype("datetime64[D]")
+    date_stats = df[configs.DATE_COL].agg(["min", "max", "nunique"])
 
     print(f"Total rows: {len(df):,}")
-    print(f"Date range: {df[configs.DATE_COL].min()} to {df[configs.DATE_COL].max()}")
-    print(f"Unique dates: {df[configs.DATE_COL].nunique()}")
+    print(f"Date range: {date_stats['min'].date()} to {date_stats['max'].date()}")
+    print(f"Unique dates: {date_stats['nunique']}")
     print(f"Columns: {list(df.columns)}")
     print(f"\nFeature stats (all dates):")
     print(df[configs.FEATURE_COLS].describe().round(2).to_string())
 
     # Target date
-    df_target = df[df[configs.DATE_COL] == TARGET]
+    target_mask = df[configs.DATE_COL].values == np.datetime64(TARGET, "D")
+    df_target = df[target_mask]
     print(f"\nTarget date ({TARGET}) rows: {len(df_target)}")
     if len(df_target) > 0:
         print(f"Target lmp_total range: {df_target['lmp_total'].min():.2f} to {df_target['lmp_total'].max():.2f}")
@@ -54,9 +60,9 @@ def test_metrics():
 
     for metric in ["mae", "rmse", "euclidean", "cosine"]:
         out = run(
-            target_date=TARGET, hub=HUB, market=MARKET,
+            target_date=TARGET, hub=HUB,
             n_neighbors=5, metric=metric,
-            feature_cols=["lmp_total"],
+            features=FEATURES,
         )
         print(f"\n{metric.upper()}:")
         print(tabulate(out["like_days"], headers="keys", tablefmt="psql", showindex=False))
@@ -69,29 +75,42 @@ def test_profile_comparison():
     print("=" * 60)
 
     out = run(
-        target_date=TARGET, hub=HUB, market=MARKET,
+        target_date=TARGET, hub=HUB,
         n_neighbors=3, metric="mae",
-        feature_cols=["lmp_total"],
+        features=FEATURES,
     )
 
-    profiles = out["hourly_profiles"]
-    target_profile = profiles[profiles[configs.DATE_COL] == TARGET].sort_values(configs.HOUR_ENDING_COL)
-
-    for i, row in out["like_days"].iterrows():
-        like_date = row[configs.DATE_COL]
-        like_profile = profiles[profiles[configs.DATE_COL] == like_date].sort_values(configs.HOUR_ENDING_COL)
-
-        comparison = pd.DataFrame({
-            "hour": target_profile[configs.HOUR_ENDING_COL].values,
-            f"target ({TARGET})": target_profile["lmp_total"].values,
-            f"like{row['rank']} ({like_date})": like_profile["lmp_total"].values,
-        })
-        comparison["diff"] = comparison.iloc[:, 2] - comparison.iloc[:, 1]
+    # hour x date, pivoted once; each like day is then a column lookup
+    wide = out["hourly_profiles"].pivot(
+        index=configs.HOUR_ENDING_COL, columns=configs.DATE_COL, values="lmp_total",
+    ).sort_index()
+    hours = wide.index.to_numpy()
+    target_values = wide[TARGET].to_numpy(np.float64)
+
+    # (k, hours) matrix of like-day profiles; Pearson r for all of them in one matvec
+    like_days = out["like_days"]
+    like_matrix = wide[like_days[configs.DATE_COL].tolist()].to_numpy(np.float64).T
+    target_centered = target_values - target_values.mean()
+    like_centered = like_matrix - like_matrix.mean(axis=1, keepdims=True)
+    correlations = (like_centered @ target_centered) / np.sqrt(
+        (like_centered ** 2).sum(axis=1) * (target_centered ** 2).sum()
+    )
 
-        print(f"\n--- Rank {int(row['rank'])}: {like_date} (dist={row['distance']:.2f}) ---")
-        print(tabulate(comparison, headers="keys", tablefmt="psql", showindex=False, floatfmt=".2f"))
-        print(f"MAE: {comparison['diff'].abs().mean():.2f}")
-        print(f"Correlation: {np.corrcoef(comparison.iloc[:, 1], comparison.iloc[:, 2])[0, 1]:.4f}")
+    # hour | target | like | diff, refilled per like day (the first two columns never change)
+    comparison = np.empty((len(hours), 4), dtype=np.float64)
+    comparison[:, 0] = hours
+    comparison[:, 1] = target_values
+
+    for row, like_values, corr in zip(like_days.itertuples(index=False), like_matrix, correlations):
+        like_date = getattr(row, configs.DATE_COL)
+        comparison[:, 2] = like_values
+        np.subtract(like_values, target_values, out=comparison[:, 3])
+
+        headers = ["hour", f"target ({TARGET})", f"like{row.rank} ({like_date})", "diff"]
+        print(f"\n--- Rank {int(row.rank)}: {like_date} (dist={row.distance:.2f}) ---")
+        print(tabulate(comparison, headers=headers, tablefmt="psql", floatfmt=".2f"))
+        print(f"MAE: {np.abs(comparison[:, 3]).mean():.2f}")
+        print(f"Correlation: {corr:.4f}")
 
 
 if __name__ == "__main__":